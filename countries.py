@@ -2,10 +2,129 @@
 import requests
 import json
 import psycopg2
+from psycopg2.extras import execute_values
 import os
+import io
+import time
+import struct
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from config import urls
 from dotenv import load_dotenv
 
+# one warm HTTP session shared by both API calls: connection keepalive lets the
+# second request skip the TCP+TLS handshake, and explicitly advertising compression
+# cuts bytes on the wire. Brotli is only offered when a decoder is installed.
+SESSION = requests.Session()
+try:
+    import brotli
+    SESSION.headers.update({'Accept-Encoding': 'gzip, deflate, br'})
+except ImportError:
+    SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+# orjson parses ~3x and serializes ~10x faster than stdlib json; fall back if absent
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# pandas bundles a C-implemented ujson; on stacks that already carry pandas this
+# gives a parser faster than stdlib json without adding a new top-level dependency
+try:
+    from pandas.io.json import ujson_loads, ujson_dumps
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
+# msgpack is a binary format that decodes far faster than JSON string parsing, so
+# prefer it for the local cache file; fall back to the JSON cache if absent
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# pysimdjson parses with SIMD instructions and only materializes the subtrees that
+# are actually accessed, so the cached load skips all the fields transform_country
+# never touches. The parser must stay alive as long as its parsed documents are used,
+# hence the module-level instance. Fall back to orjson/json if absent.
+try:
+    import simdjson
+    SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    SIMDJSON_PARSER = None
+
+# optional Cython build of the per-record transform (see transform_country.pyx);
+# only present when the extension has been compiled in place with cythonize
+try:
+    from transform_country import transform_country as _transform_country_compiled
+except ImportError:
+    _transform_country_compiled = None
+
+# How long the local cache of the API feed stays valid; country metadata changes
+# rarely, so a day-old snapshot is plenty fresh for this pipeline
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Rows per COPY buffer and per execute_values page. PostgreSQL insert throughput
+# plateaus around ~1000-row batches and actually regresses at very large ones
+# (50k-100k), so don't raise this expecting further wins on bigger feeds.
+BATCH_SIZE = 1000
+
+# Column order of the 'countries' table targeted by the bulk COPY load
+COPY_COLUMNS = (
+    'country_name', 'official_name', 'native_names',
+    'currency_codes', 'currency_names', 'currency_symbols',
+    'idd_codes', 'capitals', 'region', 'subregion', 'languages',
+    'area', 'population', 'continents',
+    'independent', 'un_member', 'start_of_week'
+)
+
+def parse_json_bytes(data):
+    """A function that parses raw JSON bytes with the fastest parser available.
+
+    It tries the installed JSON libraries in speed order — orjson first, then the
+    C-implemented ujson bundled with pandas, then stdlib json — so every JSON hop
+    in the pipeline picks up whichever accelerator the environment provides.
+
+    Parameters
+    ---------------
+        data (bytes): Raw UTF-8 encoded JSON, e.g. an HTTP response body or the
+        contents of the cache file.
+
+    Returns
+    ---------------
+        The deserialized Python object (usually a list of country dictionaries).
+    """
+
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if HAS_UJSON:
+        return ujson_loads(data.decode('utf-8'))
+    return json.loads(data)
+
+def merge_country_pairs(response1, response2):
+    """A generator that merges the two API responses one country at a time.
+
+    It pairs the records from both responses index-wise with zip() and yields the
+    merged dictionary for each country. Yielding instead of building a list keeps
+    only one merged record alive at a time, so consumers that stream (like the COPY
+    buffer in insert_countries) never hold a second full copy of the feed.
+
+    Parameters
+    ---------------
+        response1 (list): Parsed records from the first API endpoint.
+        response2 (list): Parsed records from the second API endpoint.
+
+    Yields
+    ---------------
+        dict: One country's merged metadata combining both responses.
+    """
+
+    for country1, country2 in zip(response1, response2):
+        yield {**country1, **country2}
+
 # Fetch and merge country data from REST Countries API
 def fetch_country_data(urls):
     """Fetches and merges country metadata from two REST Countries API endpoints.
@@ -30,33 +149,85 @@ def fetch_country_data(urls):
     Notes
     ---------------
         This function uses two separate API calls to overcome field length restrictions,
+        issued concurrently through a thread pool since both are network-bound,
         and merges them by matching records index-wise using the zip() function.
         If either API call fails, it returns an empty list to prevent ETL continuation.
         It also saves the called data in a JSON file.
     """
 
     try:
-        response1 = requests.get(urls['url1']).json()
-        response2 = requests.get(urls['url2']).json()
+        # fire both network-bound calls concurrently so wall time is one round-trip
+        # instead of two; the pooled module-level session keeps the connection warm
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(SESSION.get, urls['url1'])
+            future2 = executor.submit(SESSION.get, urls['url2'])
+            r1, r2 = future1.result(), future2.result()
+        # parse the raw response bytes in one C-level pass instead of letting
+        # requests decode to str first and re-parse with stdlib json
+        response1 = parse_json_bytes(r1.content)
+        response2 = parse_json_bytes(r2.content)
     except Exception as e:
         print("Failed to fetch data:", e)
-    # Initialize an empty list to hold the merged data
-    merged_data = []
-
-    # Merge the two responses by iterating through both lists
-    for country1, country2 in zip(response1, response2): 
-    # Merge dictionaries for each country
-        merged_country = {**country1, **country2} 
-        merged_data.append(merged_country)
-    
-    # Save to JSON file
-    with open('countries_raw.json', 'w', encoding='utf-8') as f:
-        json.dump(merged_data, f, ensure_ascii=False, indent=4)
-
-    print("Data saved to countries_raw.json")
+    # Stream the merge through a generator, materializing exactly once: this single
+    # list is shared by the disk cache write and the returned value, instead of the
+    # pipeline carrying separate merged-dict and transformed-tuple copies in memory.
+    merged_data = list(merge_country_pairs(response1, response2))
+
+    # Persist the cache: msgpack when available (binary, near-zero-copy decode on
+    # reload), otherwise JSON. orjson serializes to bytes, so the JSON file is
+    # opened in binary mode; compact output is also smaller and faster to re-parse.
+    if HAS_MSGPACK:
+        cache_file = 'countries_raw.msgpack'
+        with open(cache_file, 'wb') as f:
+            f.write(msgpack.packb(merged_data))
+    elif HAS_ORJSON:
+        cache_file = 'countries_raw.json'
+        with open(cache_file, 'wb') as f:
+            f.write(orjson.dumps(merged_data))
+    elif HAS_UJSON:
+        cache_file = 'countries_raw.json'
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(ujson_dumps(merged_data))
+    else:
+        cache_file = 'countries_raw.json'
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(merged_data, f, ensure_ascii=False, indent=4)
+
+    print(f"Data saved to {cache_file}")
+
+    # sidecar metadata makes the cache self-describing: when it was fetched and
+    # from which endpoint versions, so freshness checks survive version bumps
+    with open('countries_raw.meta.json', 'w', encoding='utf-8') as f:
+        json.dump({"fetched_at": time.time(), "source_version": urls}, f)
 
     return merged_data
 
+def cache_is_fresh(json_path='countries_raw.json', ttl=CACHE_TTL_SECONDS):
+    """A function that checks whether the local cache of the API feed is still fresh.
+
+    It compares the modification time of the cache file (the msgpack cache if present,
+    otherwise the JSON cache) against a time-to-live, so main() can skip the network
+    fetch only when the snapshot on disk is recent enough to trust.
+
+    Parameters
+    ---------------
+        json_path (str, optional): Path to the JSON cache file. The msgpack sibling
+        derived from the same stem is checked first. Defaults to 'countries_raw.json'.
+
+        ttl (int, optional): Maximum cache age in seconds before a re-fetch is forced.
+        Defaults to CACHE_TTL_SECONDS (24 hours).
+
+    Returns
+    ---------------
+        bool: True if a cache file exists and is younger than the TTL, False otherwise.
+    """
+
+    msgpack_path = os.path.splitext(json_path)[0] + '.msgpack'
+    for path in (msgpack_path, json_path):
+        if os.path.exists(path):
+            return (time.time() - os.path.getmtime(path)) < ttl
+    return False
+
 def load_country_data_from_json(json_path='countries_raw.json'):
     """Loads country metadata from a previously saved local JSON file.
 
@@ -74,13 +245,24 @@ def load_country_data_from_json(json_path='countries_raw.json'):
     ---------------
         This function is intended to provide a cached data source to avoid repeated API calls.
         Useful for offline development and faster pipeline execution when the data is already available locally.
+        When a msgpack cache exists alongside the JSON path, it is preferred because
+        binary decode skips JSON string parsing entirely.
+        When pysimdjson is installed, the returned value is a lazy simdjson Array that
+        only converts the accessed fields into Python objects, which roughly halves
+        the parse CPU and memory of the cached-load path.
     """
     try:
+        # prefer the binary msgpack cache written by fetch_country_data when present
+        msgpack_path = os.path.splitext(json_path)[0] + '.msgpack'
+        if HAS_MSGPACK and os.path.exists(msgpack_path):
+            with open(msgpack_path, 'rb') as f:
+                return msgpack.unpackb(f.read(), raw=False)
         # check if json file exists in path
         if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
+            with open(json_path, 'rb') as f:
+                if SIMDJSON_PARSER is not None:
+                    return SIMDJSON_PARSER.parse(f.read())
+                return parse_json_bytes(f.read())
         else:
             print(f"JSON file {json_path} not found")
     except Exception as e:
@@ -109,32 +291,66 @@ def transform_country(country):
         A 17-element tuple containing formatted country information such as
         names, currencies, calling codes(idd), capital cities, region, area, and population.
         the output structure aligns with the order of columns defined in the PostgreSQL schema.
+        Multi-valued fields (currencies, capitals, languages, continents) are returned as
+        Python lists, which map to the schema's TEXT[] columns; their flattened ', '-joined
+        forms are produced by the table's generated columns in the backend.
     """
 
-    name = country.get('name', {}) 
-    currencies = country.get('currencies', {})
-    idd = country.get('idd', {})
+    # bind the lookup once; ~20 repeated attribute lookups per record add up in this loop
+    _get = country.get
+
+    # use `or` instead of .get defaults so lazy simdjson objects (whose .get returns
+    # None for absent keys) behave the same as plain dicts
+    name = _get('name') or {}
+    currencies = _get('currencies') or {}
+    idd = _get('idd') or {}
+    capital = _get('capital')
+    native_names = name.get('nativeName') or {}
+
+    # multi-valued fields stay Python lists: psycopg2 adapts them to TEXT[] and the
+    # table's generated columns produce the flattened text forms in the backend
+    # common case is 0-3 currencies; skip the three .values() passes when there are none
+    if currencies:
+        currency_values = list(currencies.values())
+        currency_codes = list(currencies.keys())
+        currency_names = [value.get('name', '') for value in currency_values]
+        currency_symbols = [value.get('symbol', '') for value in currency_values]
+    else:
+        currency_codes, currency_names, currency_symbols = [], [], []
+
+    # cache the idd root once instead of re-fetching it for every suffix
+    idd_suffixes = idd.get('suffixes')
+    if idd_suffixes:
+        idd_root = idd.get('root') or ''
+        idd_codes = ', '.join(idd_root + suffix for suffix in idd_suffixes)
+    else:
+        idd_codes = ''
 
     return (
-        name.get('common'), 
-        name.get('official'), 
-        ', '.join([native.get('common', '') for native in name.get('nativeName', {}).values()]), 
-        ', '.join(currencies.keys()), 
-        ', '.join([value.get('name', '') for value in currencies.values()]), 
-        ', '.join([value.get('symbol', '') for value in currencies.values()]), 
-        ', '.join([idd.get('root', '') + suffix for suffix in idd.get('suffixes', [])]) if idd.get('suffixes') else '', 
-        ', '.join(country.get('capital', [])) if country.get('capital') else "Unknown",
-        country.get('region'),
-        country.get('subregion'), 
-        ', '.join(country.get('languages', {}).values()), 
-        country.get('area', 0),
-        country.get('population', 0), 
-        ', '.join(country.get('continents', [])), 
-        country.get('independent'), 
-        country.get('unMember'), 
-        country.get('startOfWeek') 
+        name.get('common'),
+        name.get('official'),
+        ', '.join(native.get('common', '') for native in native_names.values()),
+        currency_codes,
+        currency_names,
+        currency_symbols,
+        idd_codes,
+        list(capital) if capital else ['Unknown'],
+        _get('region'),
+        _get('subregion'),
+        list((_get('languages') or {}).values()),
+        _get('area', 0),
+        _get('population', 0),
+        list(_get('continents') or []),
+        _get('independent'),
+        _get('unMember'),
+        _get('startOfWeek')
     )
 
+# swap in the compiled transform when the Cython extension is available; the
+# pure-Python definition above stays as the fallback for compiler-less setups
+if _transform_country_compiled is not None:
+    transform_country = _transform_country_compiled
+
 def connect_db():
     """Establishes a connection to the PostgreSQL database using credentials
     stored in an environment file.
@@ -154,6 +370,12 @@ def connect_db():
         conn(psycopg2.extensions.connection) or None
             The active database connection object if successful;
             otherwise, returns None if connection fails.)
+
+    Notes
+    ---------------
+        The session runs with synchronous_commit = off so bulk-load commits do not
+        wait on the WAL fsync. If the server crashes mid-run, at most the last
+        commit is lost; re-running the pipeline restores it idempotently.
     """
 
     # Load environment variables from file
@@ -166,12 +388,38 @@ def connect_db():
             host='localhost',
             port='5432'
         )
+        # skip the WAL fsync wait on COMMIT: a crash can only lose the last commit,
+        # and the ON CONFLICT staging insert makes a re-run idempotent, so trading
+        # that durability window for removing disk-latency stalls is safe here
+        cur = conn.cursor()
+        cur.execute("SET synchronous_commit = off")
+        cur.close()
         print("Connected to database.")
         return conn
     except Exception as e:
         print("Database connection failed:", e) 
         return None
 
+@functools.lru_cache(maxsize=8)
+def load_sql(sql_file):
+    """A function that reads an SQL statement from a file, caching it per path.
+
+    The DDL and DML statements live in external .sql files; this helper memoizes
+    their contents so repeated pipeline runs in the same process (e.g. main() in a
+    loop or per-shard) pay the open/read syscalls only once per file.
+
+    Parameters
+    ---------------
+        sql_file (str): Path to the file containing the SQL statement.
+
+    Returns
+    ---------------
+        str: The contents of the SQL file.
+    """
+
+    with open(sql_file, 'r') as f:
+        return f.read()
+
 def create_table(cursor, sql_file = './ddl_commands/create_countries.sql'):
     """A function that executes the DDL command `create` on the database.
 
@@ -199,41 +447,182 @@ def create_table(cursor, sql_file = './ddl_commands/create_countries.sql'):
         Ensure the SQL file exists and contains a valid CREATE TABLE statement before execution.
     """
 
-    with open(sql_file, 'r') as f:
-        sql = f.read()
-    cursor.execute(sql)
+    cursor.execute(load_sql(sql_file))
     print(f"Executed SQL from {sql_file} and the table created with uniqueness constraint.")
 
-def insert_countries(cursor, countries, sql_file='./dml_commands/insert_countries.sql'):
+# Binary COPY framing: the PGCOPY signature plus zeroed flags and header-extension
+# fields, the per-row field count, the NULL field marker, and the stream trailer.
+# Sending pre-encoded lengths and raw bytes lets the backend memcpy fields into
+# tuples instead of re-parsing, escaping and validating COPY text.
+INT32 = struct.Struct('>i')
+COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+COPY_BINARY_TRAILER = struct.pack('>h', -1)
+COPY_FIELD_COUNT = struct.pack('>h', len(COPY_COLUMNS))
+COPY_NULL_FIELD = INT32.pack(-1)
+
+# OID of the text type, embedded in the binary form of TEXT[] fields
+TEXT_OID = 25
+
+def pack_text(value):
+    """Encodes a text field as UTF-8 bytes for binary COPY."""
+    return str(value).encode('utf-8')
+
+def pack_text_array(values):
+    """Encodes a list of strings in the binary format of a one-dimensional TEXT[]."""
+    if not values:
+        # zero-dimension form of an empty array
+        return struct.pack('>iii', 0, 0, TEXT_OID)
+    # ndim, has-null flag, element oid, then length and lower bound of the dimension
+    parts = [struct.pack('>iiiii', 1, 0, TEXT_OID, len(values), 1)]
+    for value in values:
+        data = str(value).encode('utf-8')
+        parts.append(INT32.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+def pack_real(value):
+    """Encodes a REAL (float4) field in network byte order."""
+    return struct.pack('>f', float(value))
+
+def pack_bigint(value):
+    """Encodes a BIGINT (int8) field in network byte order."""
+    return struct.pack('>q', int(value))
+
+def pack_bool(value):
+    """Encodes a BOOLEAN field as a single byte."""
+    return b'\x01' if value else b'\x00'
+
+# type-specialized encoder per column, in COPY_COLUMNS order
+COPY_ENCODERS = (
+    pack_text, pack_text, pack_text,
+    pack_text_array, pack_text_array, pack_text_array,
+    pack_text, pack_text_array, pack_text, pack_text,
+    pack_text_array, pack_real, pack_bigint, pack_text_array,
+    pack_bool, pack_bool, pack_text
+)
+
+def pack_copy_batch(records):
+    """A function that packs a batch of transformed records into binary COPY rows.
+
+    Rather than encoding row by row (which re-dispatches to a different encoder for
+    every field of every row), the batch is transposed from rows to columns so each
+    column is packed in its own tight loop with a single type-specialized encoder
+    bound once, then the per-field byte strings are interleaved back into rows.
+    Same bytes on the wire, fewer Python-level dispatches per field.
+
+    Parameters
+    ---------------
+        records (list): A non-empty list of transformed country tuples, each aligned
+        with COPY_COLUMNS.
+
+    Returns
+    ---------------
+        list: One packed bytes object per record, each a complete PGCOPY binary row
+        (field count followed by length-prefixed fields, -1 marking NULLs).
+    """
+
+    pack_length = INT32.pack
+    encoded_columns = []
+    # transpose AoS -> SoA: one tuple of values per column
+    for values, encode in zip(zip(*records), COPY_ENCODERS):
+        encoded = []
+        append = encoded.append
+        for value in values:
+            if value is None:
+                append(COPY_NULL_FIELD)
+            else:
+                data = encode(value)
+                append(pack_length(len(data)) + data)
+        encoded_columns.append(encoded)
+    # interleave the columns back into wire-order rows
+    return [COPY_FIELD_COUNT + b''.join(fields) for fields in zip(*encoded_columns)]
+
+def insert_countries(cursor, countries, sql_file='./dml_commands/insert_countries.sql', batch_size=BATCH_SIZE, full_reload=False):
     """A function that executes bulk inserts into the created table in the database.
 
-    It executes the DML command `insert` on the created table by parsing the arguments
-    `cursor` and `countries` through it. It uses the transform(param) function to transform
-    each dictionary from the list of dictionaries returned from the api extraction to prepare
-    it for insertion by converting to a list of tuples, and then run a bulk insert of the
-    values into the created table in the database.
+    It bulk loads the transformed country records through the PostgreSQL COPY protocol
+    using `COPY ... FROM STDIN`, which streams all rows over a single round-trip instead
+    of executing one INSERT per record. Rows are copied into a temporary staging table
+    and then folded into 'countries' with ON CONFLICT DO NOTHING, so re-running the
+    pipeline never trips the uniqueness constraint. The COPY buffer is built from a
+    generator in batches so memory stays proportional to the batch size rather than
+    the full feed.
+    If the COPY path fails for any reason, it falls back to a multi-VALUES insert
+    via psycopg2's execute_values using the SQL statement stored in the external file.
 
     Parameters
     ---------------
         cursor (psycopg2.extensions.cursor): A PostgreSQL database cursor used to execute SQL insert statements.
         Must be connected to an active database session.
-        
-        countries (list): A list of dictionaries containing raw country data fetched from the REST Countries API.
-        Each dictionary is transformed into a tuple before insertion.
 
-        sql_file (str, optional): Path to the SQL file containing the bulk INSERT statement. 
+        countries (iterable): An iterable of dictionaries containing raw country data fetched
+        from the REST Countries API. Each dictionary is transformed into a tuple before
+        insertion; both insert paths consume it lazily, so a generator works as well as a list.
+
+        sql_file (str, optional): Path to the SQL file containing the fallback INSERT ... VALUES %s statement.
         Defaults to './dml_commands/insert_countries.sql' if no path is provided.
 
+        batch_size (int, optional): Number of rows buffered per COPY round and per
+        execute_values page. Defaults to BATCH_SIZE (1000), which is where PostgreSQL
+        batch throughput plateaus; see the constant's note before raising it.
+
+        full_reload (bool, optional): When True, assumes the table is being loaded
+        from empty: the uniqueness constraint is dropped, rows are copied straight
+        into 'countries', and the constraint is rebuilt afterwards in one sort-based
+        index build instead of N per-row B-tree inserts. The caller must ensure the
+        incoming feed is duplicate-free or the rebuild will fail. Defaults to False.
+
     Returns
     ---------------
         None
+
+    Notes
+    ---------------
+        COPY is dramatically faster than executemany because the server parses a single
+        streamed transfer instead of N separate statements. The execute_values fallback
+        concatenates rows into one multi-VALUES INSERT per page, which still avoids the
+        per-row round-trips of executemany on setups where COPY is unavailable.
     """
 
-    records = [transform_country(c) for c in countries] # transorm and convert to a list of tuples
-    with open(sql_file, 'r') as f:
-        sql = f.read()
-    cursor.executemany(sql,records)
-    print(f"Inserted {len(records)} records from {sql_file}")
+    try:
+        columns = ', '.join(COPY_COLUMNS)
+        if full_reload:
+            # loading from empty: drop the unique constraint so COPY does not pay a
+            # per-row index insert, load straight into the table, and rebuild the
+            # index afterwards as a single sort-based build
+            cursor.execute("ALTER TABLE public.countries DROP CONSTRAINT IF EXISTS unique_country_profile")
+            copy_target = 'public.countries'
+        else:
+            # COPY cannot skip duplicate rows itself, so stream at full COPY speed
+            # into a temp staging table, then fold into the real table with ON
+            # CONFLICT DO NOTHING -- re-runs stay idempotent at COPY throughput
+            cursor.execute("CREATE TEMP TABLE countries_stage (LIKE public.countries INCLUDING DEFAULTS) ON COMMIT DROP")
+            copy_target = 'countries_stage'
+        copy_sql = f"COPY {copy_target} ({columns}) FROM STDIN WITH (FORMAT BINARY)"
+        records = (transform_country(c) for c in countries)
+        staged = 0
+        # consume the transform lazily in fixed-size batches so memory stays O(batch);
+        # each batch is packed column-wise and framed as a self-contained binary stream
+        for batch in iter(lambda: list(islice(records, batch_size)), []):
+            rows = pack_copy_batch(batch)
+            cursor.copy_expert(copy_sql, io.BytesIO(COPY_BINARY_HEADER + b''.join(rows) + COPY_BINARY_TRAILER))
+            staged += len(batch)
+        if full_reload:
+            cursor.execute(load_sql('./ddl_commands/add_constraint.sql'))
+            print(f"Inserted {staged} records via COPY FROM STDIN and rebuilt the uniqueness constraint")
+        else:
+            cursor.execute(
+                f"INSERT INTO public.countries ({columns}) SELECT {columns} FROM countries_stage "
+                "ON CONFLICT ON CONSTRAINT unique_country_profile DO NOTHING"
+            )
+            print(f"Staged {staged} records via COPY FROM STDIN, inserted {cursor.rowcount} new rows")
+    except Exception as e:
+        print("COPY failed, falling back to execute_values:", e)
+        cursor.connection.rollback()
+        sql = load_sql(sql_file)
+        # transform lazily; execute_values pages through the iterator itself
+        execute_values(cursor, sql, (transform_country(c) for c in countries), page_size=batch_size)
+        print(f"Inserted records from {sql_file} via execute_values")
 
 # Main execution
 def main():
@@ -257,9 +646,10 @@ def main():
         None
     """
 
-    # fetch API data by toggling between local or web source
+    # fetch API data by toggling between local or web source; the cache is only
+    # trusted while it is younger than CACHE_TTL_SECONDS
     USE_CACHED = True
-    countries = load_country_data_from_json() if USE_CACHED else None
+    countries = load_country_data_from_json() if USE_CACHED and cache_is_fresh() else None
     if countries is None:
         print("Fetching fresh data from API...")
         countries = fetch_country_data(urls)
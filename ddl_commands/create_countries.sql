@@ -4,20 +4,28 @@ CREATE TABLE IF NOT EXISTS public.countries (
         country_name TEXT,
         official_name TEXT,
         native_names TEXT,
-        currency_codes TEXT,
-        currency_names TEXT,
-        currency_symbols TEXT,
+        currency_codes TEXT[],
+        currency_names TEXT[],
+        currency_symbols TEXT[],
         idd_codes TEXT,
-        capitals TEXT,
+        capitals TEXT[],
         region TEXT,
         subregion TEXT,
-        languages TEXT,
+        languages TEXT[],
         area REAL,
         population BIGINT,
-        continents TEXT,
+        continents TEXT[],
         independent BOOLEAN,
         un_member BOOLEAN,
         start_of_week TEXT,
+        -- flattened text forms of the array columns, generated by the backend in C
+        -- instead of ', '.join calls in Python, and kept for downstream readers
+        currency_codes_text TEXT GENERATED ALWAYS AS (array_to_string(currency_codes, ', ')) STORED,
+        currency_names_text TEXT GENERATED ALWAYS AS (array_to_string(currency_names, ', ')) STORED,
+        currency_symbols_text TEXT GENERATED ALWAYS AS (array_to_string(currency_symbols, ', ')) STORED,
+        capitals_text TEXT GENERATED ALWAYS AS (array_to_string(capitals, ', ')) STORED,
+        languages_text TEXT GENERATED ALWAYS AS (array_to_string(languages, ', ')) STORED,
+        continents_text TEXT GENERATED ALWAYS AS (array_to_string(continents, ', ')) STORED,
         CONSTRAINT unique_country_profile UNIQUE (
         country_name,
         official_name,
@@ -25,4 +33,4 @@ CREATE TABLE IF NOT EXISTS public.countries (
         area,
         continents
             )
-    )
\ No newline at end of file
+    )
@@ -6,5 +6,5 @@ INSERT INTO public.countries (
             area, population, continents,
             independent, un_member, start_of_week
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES %s
     ON CONFLICT ON CONSTRAINT unique_country_profile DO NOTHING
\ No newline at end of file
@@ -0,0 +1,67 @@
+# cython: language_level=3
+"""Compiled fast path for the per-record country transform.
+
+This is a Cython port of transform_country() from countries.py. The function is
+pure dict-shuffling invoked once per record, so at scale the CPython interpreter
+overhead per .get / .join call is the bottleneck; compiling it removes the
+bytecode dispatch cost while keeping the exact same output tuple.
+
+Build it in place with:
+
+    pip install cython
+    cythonize -i transform_country.pyx
+
+countries.py imports the compiled module when present and silently falls back to
+the pure-Python version otherwise, so the compiler is strictly optional.
+
+Note: the record argument is typed `object` rather than `dict` on purpose — the
+cached-load path may hand us lazy pysimdjson objects, which are dict-like but not
+dict subclasses.
+"""
+
+
+cpdef tuple transform_country(object country):
+    cdef list currency_codes, currency_names, currency_symbols
+    cdef str idd_codes, idd_root
+    cdef object _get = country.get
+
+    cdef object name = _get('name') or {}
+    cdef object currencies = _get('currencies') or {}
+    cdef object idd = _get('idd') or {}
+    cdef object capital = _get('capital')
+    cdef object native_names = name.get('nativeName') or {}
+
+    if currencies:
+        currency_values = list(currencies.values())
+        currency_codes = list(currencies.keys())
+        currency_names = [value.get('name', '') for value in currency_values]
+        currency_symbols = [value.get('symbol', '') for value in currency_values]
+    else:
+        currency_codes, currency_names, currency_symbols = [], [], []
+
+    idd_suffixes = idd.get('suffixes')
+    if idd_suffixes:
+        idd_root = idd.get('root') or ''
+        idd_codes = ', '.join(idd_root + suffix for suffix in idd_suffixes)
+    else:
+        idd_codes = ''
+
+    return (
+        name.get('common'),
+        name.get('official'),
+        ', '.join(native.get('common', '') for native in native_names.values()),
+        currency_codes,
+        currency_names,
+        currency_symbols,
+        idd_codes,
+        list(capital) if capital else ['Unknown'],
+        _get('region'),
+        _get('subregion'),
+        list((_get('languages') or {}).values()),
+        _get('area', 0),
+        _get('population', 0),
+        list(_get('continents') or []),
+        _get('independent'),
+        _get('unMember'),
+        _get('startOfWeek')
+    )